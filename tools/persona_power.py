@@ -1,23 +1,26 @@
 import argparse
 import json
 import sqlite3
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 DB_PATH = Path(__file__).resolve().parent.parent / "Superpower_list.db"
 
 
-def table_exists(conn: sqlite3.Connection, name: str) -> bool:
-    row = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-        (name,)
-    ).fetchone()
-    return row is not None
+def _configure(conn: sqlite3.Connection) -> None:
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA cache_size = -131072;")
+    conn.execute("PRAGMA mmap_size = 2147483648;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
 
 
 def ensure_persona_power_schema(conn: sqlite3.Connection) -> None:
     """Create or upgrade persona_power to the expected shape."""
-    if not table_exists(conn, "persona_power"):
+    # One query answers both "does it exist" (no rows) and "which columns".
+    cols = {name for (name,) in conn.execute("SELECT name FROM pragma_table_info('persona_power')")}
+    if not cols:
         conn.execute("""
             CREATE TABLE persona_power (
               persona_id TEXT NOT NULL,
@@ -31,7 +34,6 @@ def ensure_persona_power_schema(conn: sqlite3.Connection) -> None:
             )
         """)
     else:
-        cols = {c[1] for c in conn.execute("PRAGMA table_info(persona_power)")}
         needs_upgrade = not {"power_id", "mastery_level", "is_unlocked"} <= cols
         if needs_upgrade:
             conn.execute("""
@@ -75,7 +77,23 @@ def ensure_persona_power_schema(conn: sqlite3.Connection) -> None:
     conn.execute("CREATE INDEX IF NOT EXISTS idx_persona_power_persona ON persona_power (persona_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_persona_power_power ON persona_power (power_id)")
 
-    # Triggers to enforce expression->power consistency
+    # Covering index for load_expressions: index-only scan, no temp B-tree for the ORDER BY.
+    has_expr_index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_power_expr_enabled'"
+    ).fetchone()
+    if not has_expr_index:
+        conn.execute("""
+            CREATE INDEX idx_power_expr_enabled
+            ON power_expression (power_id, expression_id, is_enabled)
+            WHERE is_enabled = 1
+        """)
+        conn.execute("ANALYZE power_expression")
+
+    create_consistency_triggers(conn)
+
+
+def create_consistency_triggers(conn: sqlite3.Connection) -> None:
+    """Triggers to enforce expression->power consistency on hand-authored rows."""
     conn.execute("""
         CREATE TRIGGER IF NOT EXISTS persona_power_check_insert
         BEFORE INSERT ON persona_power
@@ -111,11 +129,26 @@ def load_expressions(conn: sqlite3.Connection) -> Dict[int, List[str]]:
         FROM power_expression
         WHERE is_enabled = 1
         ORDER BY power_id, expression_id
-    """).fetchall()
-    grouped: Dict[int, List[str]] = {}
+    """)
+    grouped: Dict[int, List[str]] = defaultdict(list)
     for power_id, expr_id in rows:
-        grouped.setdefault(int(power_id), []).append(str(expr_id))
-    return grouped
+        grouped[int(power_id)].append(str(expr_id))
+    return dict(grouped)
+
+
+def load_leading_expressions(conn: sqlite3.Connection, per_power: int) -> List[Tuple[int, str]]:
+    """Return (power_id, expression_id) for the first `per_power` expressions of each power."""
+    rows = conn.execute("""
+        SELECT power_id, expression_id
+        FROM (
+            SELECT power_id, expression_id,
+                   ROW_NUMBER() OVER (PARTITION BY power_id ORDER BY expression_id) AS rn
+            FROM power_expression
+            WHERE is_enabled = 1
+        )
+        WHERE rn <= ?
+    """, (per_power,))
+    return [(int(power_id), str(expr_id)) for power_id, expr_id in rows]
 
 
 def seed_persona(
@@ -126,33 +159,36 @@ def seed_persona(
     modifiers: Dict,
     replace: bool,
 ) -> int:
-    grouped = load_expressions(conn)
+    bindings = load_leading_expressions(conn, expressions_per_power)
 
+    conn.execute("PRAGMA foreign_keys = ON;")
     conn.execute("BEGIN;")
     if replace:
         conn.execute("DELETE FROM persona_power WHERE persona_id = ?", (persona_id,))
 
-    inserted = 0
-    for power_id, expr_ids in grouped.items():
-        for expr_id in expr_ids[:expressions_per_power]:
-            conn.execute("""
-                INSERT INTO persona_power (persona_id, power_id, expression_id, mastery_level, modifiers, is_unlocked)
-                VALUES (?, ?, ?, ?, ?, 1)
-                ON CONFLICT(persona_id, expression_id) DO UPDATE SET
-                    mastery_level=excluded.mastery_level,
-                    modifiers=excluded.modifiers,
-                    is_unlocked=1
-            """, (
-                persona_id,
-                int(power_id),
-                expr_id,
-                int(mastery_level),
-                json.dumps(modifiers, ensure_ascii=False),
-            ))
-            inserted += 1
-
+    # Bindings come straight from power_expression, so the per-row consistency
+    # triggers are redundant here. Dropping and recreating them inside the same
+    # transaction means no other connection ever sees them missing.
+    conn.execute("DROP TRIGGER IF EXISTS persona_power_check_insert")
+    conn.execute("DROP TRIGGER IF EXISTS persona_power_check_update")
+
+    modifiers_json = json.dumps(modifiers, ensure_ascii=False)
+    rows = [
+        (persona_id, power_id, expr_id, int(mastery_level), modifiers_json)
+        for power_id, expr_id in bindings
+    ]
+    conn.executemany("""
+        INSERT INTO persona_power (persona_id, power_id, expression_id, mastery_level, modifiers, is_unlocked)
+        VALUES (?, ?, ?, ?, ?, 1)
+        ON CONFLICT(persona_id, expression_id) DO UPDATE SET
+            mastery_level=excluded.mastery_level,
+            modifiers=excluded.modifiers,
+            is_unlocked=1
+    """, rows)
+
+    create_consistency_triggers(conn)
     conn.execute("COMMIT;")
-    return inserted
+    return len(rows)
 
 
 def main() -> None:
@@ -170,7 +206,7 @@ def main() -> None:
         raise FileNotFoundError(f"DB not found at {db_file}")
 
     conn = sqlite3.connect(db_file)
-    conn.execute("PRAGMA foreign_keys = ON;")
+    _configure(conn)
 
     ensure_persona_power_schema(conn)
     print("persona_power schema ensured.")
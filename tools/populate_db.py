@@ -4,10 +4,22 @@ import json
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Set, List, Tuple, Optional
+from typing import Dict, Iterable, Set, List, Tuple, Optional, Sequence
 
 DB_PATH = Path(__file__).resolve().parent.parent / "Superpower_list.db"
 LOCALE = "en-GB"
+BATCH_SIZE = 10_000
+# Bound parameters per multi-row VALUES statement. 999 is the default
+# SQLITE_MAX_VARIABLE_NUMBER before SQLite 3.32, so this is safe on any build.
+VALUES_MAX_PARAMS = 999
+# Tables every populate run empties and refills.
+GENERATED_TABLES = [
+    "power_expression",
+    "power_expression_text",
+    "power_expression_cost",
+    "power_expression_signature",
+    "power_acquisition_profile",
+]
 
 
 # -------------------------
@@ -19,6 +31,14 @@ def stable_id(*parts: str) -> str:
     return hashlib.sha1(raw).hexdigest()
 
 
+def _configure(conn: sqlite3.Connection) -> None:
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA cache_size = -131072;")
+    conn.execute("PRAGMA mmap_size = 2147483648;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+
+
 def table_exists(conn: sqlite3.Connection, name: str) -> bool:
     row = conn.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
@@ -33,14 +53,55 @@ def require_tables(conn: sqlite3.Connection, names: List[str]) -> None:
         raise RuntimeError(f"Missing required tables: {missing}")
 
 
+def insert_batched(conn: sqlite3.Connection, sql: str, rows: Sequence[Tuple]) -> int:
+    """executemany() in BATCH_SIZE slices; returns the number of rows written."""
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.executemany(sql, rows[start:start + BATCH_SIZE])
+    return len(rows)
+
+
+def insert_values(conn: sqlite3.Connection, head: str, rows: Sequence[Tuple]) -> int:
+    """Insert narrow rows as multi-row VALUES statements of up to VALUES_MAX_PARAMS values.
+
+    `head` is the INSERT ... (columns) part. One statement per chunk runs as a
+    single VDBE program, which beats executemany() re-stepping per row.
+    """
+    if not rows:
+        return 0
+    chunk_rows = VALUES_MAX_PARAMS // len(rows[0])
+    row_sql = "(" + ",".join("?" for _ in rows[0]) + ")"
+    full_sql = f"{head} VALUES {','.join([row_sql] * chunk_rows)}"
+    for start in range(0, len(rows), chunk_rows):
+        chunk = rows[start:start + chunk_rows]
+        sql = full_sql if len(chunk) == chunk_rows else f"{head} VALUES {','.join([row_sql] * len(chunk))}"
+        conn.execute(sql, [value for row in chunk for value in row])
+    return len(rows)
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection, tables: List[str]) -> List[str]:
+    """Drop the explicit indexes on `tables` and return their DDL for recreation.
+
+    Constraint autoindexes (sql IS NULL) cannot be dropped and are left alone.
+    """
+    placeholders = ",".join("?" for _ in tables)
+    rows = conn.execute(
+        f"SELECT name, sql FROM sqlite_master WHERE type='index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})",
+        tables,
+    ).fetchall()
+    for name, _ in rows:
+        conn.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in rows]
+
+
 def load_power_tags(conn: sqlite3.Connection) -> Dict[str, Set[str]]:
+    """Tags per power_id, already stripped and lowercased; callers rely on that."""
     tags: Dict[str, Set[str]] = {}
     for power_id, tag in conn.execute("SELECT power_id, tag FROM power_tag"):
         tags.setdefault(str(power_id), set()).add(str(tag).strip().lower())
     return tags
 
 
-def _extract_kind(raw_tags: Set[str]) -> str:
+def _extract_kind(raw_tags: Iterable[str]) -> str:
     for tag in raw_tags:
         if tag.lower().startswith("kind:"):
             return tag.split(":", 1)[1].strip()
@@ -52,23 +113,21 @@ def load_powers(conn: sqlite3.Connection) -> List[Tuple[str, str, str]]:
     rows = conn.execute("SELECT rowid, name, tags FROM Superpower4").fetchall()
     out: List[Tuple[str, str, str]] = []
     for pid, name, tags in rows:
-        # Prefer explicit kind: tag, otherwise empty
-        tag_set = set()
-        if tags:
-            tag_set = {t.strip().lower() for t in str(tags).split(",") if t.strip()}
-        kind = _extract_kind(tag_set)
+        # Prefer explicit kind: tag, otherwise empty. Only the kind is needed, so
+        # scan the raw list lazily instead of building the full tag set.
+        kind = _extract_kind(t.strip().lower() for t in str(tags).split(",")) if tags else ""
         out.append((str(pid), str(name), kind))
     return out
 
 
 def load_kinds(conn: sqlite3.Connection) -> Set[str]:
-    tags = load_power_tags(conn)
-    kinds: Set[str] = set()
-    for tset in tags.values():
-        k = _extract_kind(tset)
-        if k:
-            kinds.add(k)
-    return kinds
+    # Let SQLite filter the kind: prefix rather than loading every tag into Python.
+    rows = conn.execute("""
+        SELECT DISTINCT TRIM(SUBSTR(LOWER(TRIM(tag)), 6))
+        FROM power_tag
+        WHERE LOWER(TRIM(tag)) LIKE 'kind:%'
+    """)
+    return {kind for (kind,) in rows if kind}
 
 
 # -------------------------
@@ -131,23 +190,24 @@ def seed_expression_templates(conn: sqlite3.Connection) -> None:
          {"always_on": True}, 80),
     ]
 
-    # Insert or replace
-    conn.execute("BEGIN;")
+    # The table is emptied first, so a plain INSERT needs no conflict handling.
     conn.execute("DELETE FROM expression_template")
-    for template_id, kind_match, tags_any, form, delivery, scale, default_constraints, rarity_weight in templates:
-        conn.execute("""
-            INSERT OR REPLACE INTO expression_template
-            (template_id, kind_match, tags_any, form, delivery, scale, default_constraints, rarity_weight, is_enabled)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
-        """, (
+    rows = [
+        (
             template_id,
             kind_match,
             json.dumps(tags_any, ensure_ascii=False),
             form, delivery, scale,
             json.dumps(default_constraints, ensure_ascii=False),
             int(rarity_weight),
-        ))
-    conn.execute("COMMIT;")
+        )
+        for template_id, kind_match, tags_any, form, delivery, scale, default_constraints, rarity_weight in templates
+    ]
+    conn.executemany("""
+        INSERT INTO expression_template
+        (template_id, kind_match, tags_any, form, delivery, scale, default_constraints, rarity_weight, is_enabled)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+    """, rows)
 
 
 # -------------------------
@@ -164,16 +224,16 @@ def load_expression_templates(conn: sqlite3.Connection) -> List[dict]:
 
     out = []
     for template_id, kind_match, tags_any, form, delivery, scale, default_constraints, rarity_weight in rows:
-        out.append({
+        out.append(_prepare_template({
             "template_id": str(template_id),
             "kind_match": (str(kind_match).strip() if kind_match is not None else None),
-            "tags_any": set(json.loads(tags_any)) if tags_any else set(),
+            "tags_any": frozenset(t.lower() for t in json.loads(tags_any)) if tags_any else frozenset(),
             "form": str(form),
             "delivery": str(delivery),
             "scale": str(scale),
             "constraints": json.loads(default_constraints) if default_constraints else {},
             "rarity_weight": int(rarity_weight),
-        })
+        }))
     return out
 
 
@@ -181,25 +241,26 @@ def template_matches(power_kind: str, power_tags: Set[str], tmpl: dict) -> bool:
     # Tags drive matching; kind_match is rarely used with this dataset.
     if tmpl["kind_match"] and tmpl["kind_match"] != power_kind:
         return False
-    if tmpl["tags_any"]:
-        return len(power_tags.intersection({t.lower() for t in tmpl["tags_any"]})) > 0
-    return True
+    # tags_any is lowercased once in load_expression_templates.
+    return not tmpl["tags_any"] or not power_tags.isdisjoint(tmpl["tags_any"])
+
+
+FORM_SUFFIX = {
+    "BEAM": "Lance",
+    "PROJECTILE": "Bolt",
+    "TOUCH": "Touch",
+    "AURA": "Aegis",
+    "ZONE": "Field",
+    "CONSTRUCT": "Construct",
+    "SUMMON": "Summon",
+    "PASSIVE": "Trait",
+    "MOVEMENT": "Step",
+    "SENSE": "Sense",
+}
 
 
 def make_ui_name(power_name: str, form: str) -> str:
-    suffix = {
-        "BEAM": "Lance",
-        "PROJECTILE": "Bolt",
-        "TOUCH": "Touch",
-        "AURA": "Aegis",
-        "ZONE": "Field",
-        "CONSTRUCT": "Construct",
-        "SUMMON": "Summon",
-        "PASSIVE": "Trait",
-        "MOVEMENT": "Step",
-        "SENSE": "Sense",
-    }.get(form, form.title())
-    return f"{power_name} {suffix}"
+    return f"{power_name} {FORM_SUFFIX.get(form, form.title())}"
 
 
 def tooltip_short(power_name: str, form: str) -> str:
@@ -219,16 +280,58 @@ def tooltip_rules(constraints: dict) -> str:
     return ". ".join(bits) + "." if bits else "Standard rules."
 
 
-def generate_power_expressions(conn: sqlite3.Connection, max_per_power: int = 3) -> None:
-    require_tables(conn, ["power_expression", "power_expression_text", "Superpower4", "power_tag", "expression_template"])
+def _prepare_template(tmpl: dict) -> dict:
+    # Serialized and rendered once per template rather than once per generated expression row.
+    tmpl["constraints_json"] = json.dumps(tmpl["constraints"], ensure_ascii=False)
+    tmpl["rules"] = tooltip_rules(tmpl["constraints"])
+    return tmpl
+
+
+# Universal safety net: always a neutral TOUCH, optionally a PROJECTILE if elemental/energy tags exist.
+FALLBACK_TOUCH_NEUTRAL = _prepare_template({
+    "template_id": "fallback_touch_neutral", "form": "TOUCH", "delivery": "INSTANT",
+    "scale": "STREET", "constraints": {"requires_contact": True, "cooldown": 2}, "rarity_weight": 12,
+})
+FALLBACK_PROJECTILE_ELEMENT = _prepare_template({
+    "template_id": "fallback_projectile_element", "form": "PROJECTILE", "delivery": "INSTANT",
+    "scale": "STREET", "constraints": {"range_m": 15, "cooldown": 2}, "rarity_weight": 10,
+})
+FALLBACK_AURA_CONTROL = _prepare_template({
+    "template_id": "fallback_aura_control", "form": "AURA", "delivery": "TOGGLED",
+    "scale": "STREET", "constraints": {"cost_per_tick": {"focus": 1}}, "rarity_weight": 9,
+})
+FALLBACK_TOUCH_FOLLOWUP = _prepare_template({
+    "template_id": "fallback_touch_followup", "form": "TOUCH", "delivery": "TRIGGERED",
+    "scale": "STREET", "constraints": {"requires_contact": True, "cooldown": 3}, "rarity_weight": 8,
+})
+
+
+def generate_power_expressions(
+    conn: sqlite3.Connection,
+    max_per_power: int = 3,
+    tags_by_power: Optional[Dict[str, Set[str]]] = None,
+) -> None:
+    require_tables(conn, [
+        "power_expression", "power_expression_text",
+        "power_expression_cost", "power_expression_signature",
+        "Superpower4", "power_tag", "expression_template",
+    ])
 
-    tags_by_power = load_power_tags(conn)
+    if tags_by_power is None:
+        tags_by_power = load_power_tags(conn)
     templates = load_expression_templates(conn)
 
     powers = load_powers(conn)
 
-    created = 0
-    conn.execute("BEGIN;")
+    rows_expr: List[Tuple] = []
+    rows_text: List[Tuple] = []
+    # One timestamp for the whole run; every text row is generated together.
+    updated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    # Children first: the ON DELETE CASCADE from power_expression would remove
+    # these rows anyway, but with one child lookup per parent row, and with the
+    # expression_id indexes dropped for the load each lookup is a table scan.
+    conn.execute("DELETE FROM power_expression_cost")
+    conn.execute("DELETE FROM power_expression_signature")
     conn.execute("DELETE FROM power_expression_text")
     conn.execute("DELETE FROM power_expression")
 
@@ -240,29 +343,16 @@ def generate_power_expressions(conn: sqlite3.Connection, max_per_power: int = 3)
         matches = [t for t in templates if template_matches(kind, power_tags, t)]
 
         def fallback_templates() -> List[dict]:
-            # Universal safety net: always a neutral TOUCH, optionally a PROJECTILE if elemental/energy tags exist.
             def has_any(options: Set[str]) -> bool:
-                return bool(power_tags.intersection(options))
+                return not power_tags.isdisjoint(options)
 
-            items = [
-                {"template_id": "fallback_touch_neutral", "form": "TOUCH", "delivery": "INSTANT",
-                 "scale": "STREET", "constraints": {"requires_contact": True, "cooldown": 2}, "rarity_weight": 12},
-            ]
+            items = [FALLBACK_TOUCH_NEUTRAL]
             if has_any({"energy", "light", "heat", "electricity", "fire", "ice", "water", "earth", "air", "shadow", "dark", "darkness"}):
-                items.append({
-                    "template_id": "fallback_projectile_element", "form": "PROJECTILE", "delivery": "INSTANT",
-                    "scale": "STREET", "constraints": {"range_m": 15, "cooldown": 2}, "rarity_weight": 10
-                })
+                items.append(FALLBACK_PROJECTILE_ELEMENT)
             elif has_any({"control", "manipulation", "change", "absorb", "magic", "reality", "time"}):
-                items.append({
-                    "template_id": "fallback_aura_control", "form": "AURA", "delivery": "TOGGLED",
-                    "scale": "STREET", "constraints": {"cost_per_tick": {"focus": 1}}, "rarity_weight": 9
-                })
+                items.append(FALLBACK_AURA_CONTROL)
             else:
-                items.append({
-                    "template_id": "fallback_touch_followup", "form": "TOUCH", "delivery": "TRIGGERED",
-                    "scale": "STREET", "constraints": {"requires_contact": True, "cooldown": 3}, "rarity_weight": 8
-                })
+                items.append(FALLBACK_TOUCH_FOLLOWUP)
             return items
 
         if not matches:
@@ -282,32 +372,32 @@ def generate_power_expressions(conn: sqlite3.Connection, max_per_power: int = 3)
         for t in matches:
             expr_id = stable_id(power_id, t["template_id"], t["form"], t["delivery"])
             ui = make_ui_name(power_name, t["form"])
-            rules = tooltip_rules(t["constraints"])
 
-            conn.execute("""
-                INSERT OR REPLACE INTO power_expression
-                (expression_id, power_id, expression_name, form, delivery, scale, constraints, tags_override, is_enabled)
-                VALUES (?, ?, ?, ?, ?, ?, ?, NULL, 1)
-            """, (
+            rows_expr.append((
                 expr_id, power_id, ui, t["form"], t["delivery"], t["scale"],
-                json.dumps(t["constraints"], ensure_ascii=False),
+                t["constraints_json"],
             ))
-
-            conn.execute("""
-                INSERT OR REPLACE INTO power_expression_text
-                (expression_id, locale, ui_name, tooltip_short, tooltip_rules, text_source, text_version, updated_at)
-                VALUES (?, ?, ?, ?, ?, 'GENERATED', 1, ?)
-            """, (
+            rows_text.append((
                 expr_id, LOCALE, ui,
                 tooltip_short(power_name, t["form"]),
-                rules,
-                datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                t["rules"],
+                updated_at,
             ))
 
-            created += 1
-
-    conn.execute("COMMIT;")
-    print(f"Expressions created/updated: {created}")
+    # Expression ids are unique per power/template and the table was emptied above.
+    written_expr = insert_batched(conn, """
+        INSERT INTO power_expression
+        (expression_id, power_id, expression_name, form, delivery, scale, constraints, tags_override, is_enabled)
+        VALUES (?, ?, ?, ?, ?, ?, ?, NULL, 1)
+    """, rows_expr)
+    # OR REPLACE stays: trg_power_expression_text_autogen has already inserted
+    # a placeholder text row for every new expression.
+    insert_batched(conn, """
+        INSERT OR REPLACE INTO power_expression_text
+        (expression_id, locale, ui_name, tooltip_short, tooltip_rules, text_source, text_version, updated_at)
+        VALUES (?, ?, ?, ?, ?, 'GENERATED', 1, ?)
+    """, rows_text)
+    print(f"Expressions created/updated: {written_expr}")
 
 
 # -------------------------
@@ -321,28 +411,28 @@ def _base_cooldown(constraints: dict, default: int) -> int:
         return default
 
 
-def generate_power_expression_costs(conn: sqlite3.Connection) -> None:
+def generate_power_expression_costs(conn: sqlite3.Connection, tags_by_power: Optional[Dict[str, Set[str]]] = None) -> None:
     require_tables(conn, ["power_expression_cost", "power_expression", "power_tag"])
-    tags_by_power = load_power_tags(conn)
+    if tags_by_power is None:
+        tags_by_power = load_power_tags(conn)
 
-    conn.execute("BEGIN;")
     conn.execute("DELETE FROM power_expression_cost")
 
+    # Streamed from the cursor; nothing is written until the loop has finished.
     rows = conn.execute("""
         SELECT e.expression_id, e.power_id, e.form, e.delivery, e.constraints
         FROM power_expression e
         WHERE e.is_enabled = 1
-    """).fetchall()
+    """)
 
-    created = 0
+    rows_cost: List[Tuple[str, str, int]] = []
     for expr_id, power_id, form, delivery, constraints_json in rows:
         constraints = json.loads(constraints_json or "{}")
         tags = tags_by_power.get(str(power_id), set())
-        tags_lower = {t.lower() for t in tags}
 
         costs = []
         if form == "TOUCH":
-            if {"mind", "psychic", "mental"} & tags_lower:
+            if not tags.isdisjoint(("mind", "psychic", "mental")):
                 costs.append(("FOCUS", 1))
             else:
                 costs.append(("STAMINA", 1))
@@ -366,50 +456,50 @@ def generate_power_expression_costs(conn: sqlite3.Connection) -> None:
             # No direct cost; leave empty for now.
             costs = []
 
-        for ctype, value in costs:
-            conn.execute("""
-                INSERT INTO power_expression_cost (expression_id, cost_type, value)
-                VALUES (?, ?, ?)
-            """, (expr_id, ctype, int(value)))
-            created += 1
-
-    conn.execute("COMMIT;")
-    print(f"Expression costs created/updated: {created}")
-
-
-def generate_power_expression_signatures(conn: sqlite3.Connection) -> None:
+        rows_cost.extend((expr_id, ctype, int(value)) for ctype, value in costs)
+
+    written_cost = insert_batched(conn, """
+        INSERT INTO power_expression_cost (expression_id, cost_type, value)
+        VALUES (?, ?, ?)
+    """, rows_cost)
+    print(f"Expression costs created/updated: {written_cost}")
+
+
+FORM_STRENGTH = {
+    "TOUCH": 15,
+    "PROJECTILE": 35,
+    "BEAM": 40,
+    "ZONE": 50,
+    "AURA": 45,
+    "SUMMON": 70,
+    "SENSE": 10,
+    "MOVEMENT": 25,
+}
+FORM_PERSISTENCE = {
+    "TOUCH": 2,
+    "PROJECTILE": 3,
+    "BEAM": 3,
+    "ZONE": 6,
+    "AURA": 6,
+    "SUMMON": 10,
+    "SENSE": 8,
+    "MOVEMENT": 4,
+}
+
+
+def generate_power_expression_signatures(conn: sqlite3.Connection, tags_by_power: Optional[Dict[str, Set[str]]] = None) -> None:
     require_tables(conn, ["power_expression_signature", "power_expression", "power_tag"])
-    tags_by_power = load_power_tags(conn)
+    if tags_by_power is None:
+        tags_by_power = load_power_tags(conn)
 
-    conn.execute("BEGIN;")
     conn.execute("DELETE FROM power_expression_signature")
 
+    # Streamed from the cursor; nothing is written until the loop has finished.
     rows = conn.execute("""
         SELECT e.expression_id, e.power_id, e.form, e.delivery, e.constraints
         FROM power_expression e
         WHERE e.is_enabled = 1
-    """).fetchall()
-
-    form_strength = {
-        "TOUCH": 15,
-        "PROJECTILE": 35,
-        "BEAM": 40,
-        "ZONE": 50,
-        "AURA": 45,
-        "SUMMON": 70,
-        "SENSE": 10,
-        "MOVEMENT": 25,
-    }
-    form_persistence = {
-        "TOUCH": 2,
-        "PROJECTILE": 3,
-        "BEAM": 3,
-        "ZONE": 6,
-        "AURA": 6,
-        "SUMMON": 10,
-        "SENSE": 8,
-        "MOVEMENT": 4,
-    }
+    """)
 
     visual_tags = {
         "light", "dark", "darkness", "shadow", "invisibility", "illusion",
@@ -428,16 +518,53 @@ def generate_power_expression_signatures(conn: sqlite3.Connection) -> None:
     kinetic_tags = {"strength", "powerful", "earth", "pain"}
     radiation_tags = {"radiation"}
 
-    created = 0
+    # Give every category tag one bit, so each per-row category test is a single
+    # int AND against the power's precomputed mask instead of a set intersection.
+    tag_bit: Dict[str, int] = {}
+    for tag_set in (visual_tags, em_tags, thermal_tags, acoustic_tags, chemical_tags, bio_tags, psychic_tags,
+                    dimensional_tags, grav_tags, arcane_tags, causal_tags, kinetic_tags, radiation_tags):
+        for tag in tag_set:
+            tag_bit.setdefault(tag, 1 << len(tag_bit))
+
+    def mask_of(tags: Set[str]) -> int:
+        mask = 0
+        for tag in tags:
+            mask |= tag_bit.get(tag, 0)
+        return mask
+
+    mask_by_power = {power_id: mask_of(tags) for power_id, tags in tags_by_power.items()}
+    em_mask = mask_of(em_tags)
+    thermal_mask = mask_of(thermal_tags)
+    bio_mask = mask_of(bio_tags)
+    dimensional_mask = mask_of(dimensional_tags)
+    arcane_mask = mask_of(arcane_tags)
+
+    # Tag-driven extras, checked in priority order.
+    extras = [
+        (mask_of(visual_tags), "VISUAL_ANOMALY"),
+        (em_mask, "EM_SPIKE"),
+        (thermal_mask, "THERMAL_BLOOM"),
+        (mask_of(acoustic_tags), "ACOUSTIC_SHOCK"),
+        (mask_of(chemical_tags), "CHEMICAL_RESIDUE"),
+        (bio_mask, "BIO_MARKER"),
+        (mask_of(psychic_tags), "PSYCHIC_ECHO"),
+        (dimensional_mask, "DIMENSIONAL_RESIDUE"),
+        (mask_of(grav_tags), "GRAVITIC_DISTURBANCE"),
+        (arcane_mask, "ARCANE_RESONANCE"),
+        (mask_of(causal_tags), "CAUSAL_IMPRINT"),
+        (mask_of(kinetic_tags), "KINETIC_STRESS"),
+        (mask_of(radiation_tags), "RADIATION_TRACE"),
+    ]
+
+    rows_sig: List[Tuple[str, str, int, int]] = []
     for expr_id, power_id, form, delivery, constraints_json in rows:
-        tags = tags_by_power.get(str(power_id), set())
-        tags_lower = {t.lower() for t in tags}
+        tags_mask = mask_by_power.get(str(power_id), 0)
 
         signatures: Dict[str, Tuple[int, int]] = {}
 
         def add(sig_type: str, strength: Optional[int] = None, persistence: Optional[int] = None) -> None:
-            base_strength = form_strength.get(form, 20)
-            base_persist = form_persistence.get(form, 2)
+            base_strength = FORM_STRENGTH.get(form, 20)
+            base_persist = FORM_PERSISTENCE.get(form, 2)
             s = strength if strength is not None else base_strength
             p = persistence if persistence is not None else base_persist
             prev = signatures.get(sig_type)
@@ -452,19 +579,19 @@ def generate_power_expression_signatures(conn: sqlite3.Connection) -> None:
             # Step A: form-driven base
             if form in ("PROJECTILE", "BEAM"):
                 add("VISUAL_ANOMALY")
-                if tags_lower & em_tags:
+                if tags_mask & em_mask:
                     add("EM_SPIKE")
-                if tags_lower & thermal_tags:
+                if tags_mask & thermal_mask:
                     add("THERMAL_BLOOM")
             elif form in ("ZONE", "AURA"):
                 add("VISUAL_ANOMALY")
             elif form == "TOUCH":
-                if tags_lower & bio_tags:
+                if tags_mask & bio_mask:
                     add("BIO_MARKER", strength=12, persistence=2)
                 else:
                     add("VISUAL_ANOMALY", strength=10, persistence=1)
             elif form == "MOVEMENT":
-                if tags_lower & dimensional_tags:
+                if tags_mask & dimensional_mask:
                     add("DIMENSIONAL_RESIDUE", strength=25, persistence=4)
                 else:
                     add("VISUAL_ANOMALY", strength=20, persistence=3)
@@ -472,46 +599,35 @@ def generate_power_expression_signatures(conn: sqlite3.Connection) -> None:
                 add("PSYCHIC_ECHO", strength=10, persistence=8)
             elif form == "SUMMON":
                 add("DIMENSIONAL_RESIDUE", strength=70, persistence=10)
-                if tags_lower & arcane_tags:
+                if tags_mask & arcane_mask:
                     add("ARCANE_RESONANCE", strength=65, persistence=8)
 
-            # Step B: tag-driven extras (0-2)
-            extras = [
-                (visual_tags, "VISUAL_ANOMALY"),
-                (em_tags, "EM_SPIKE"),
-                (thermal_tags, "THERMAL_BLOOM"),
-                (acoustic_tags, "ACOUSTIC_SHOCK"),
-                (chemical_tags, "CHEMICAL_RESIDUE"),
-                (bio_tags, "BIO_MARKER"),
-                (psychic_tags, "PSYCHIC_ECHO"),
-                (dimensional_tags, "DIMENSIONAL_RESIDUE"),
-                (grav_tags, "GRAVITIC_DISTURBANCE"),
-                (arcane_tags, "ARCANE_RESONANCE"),
-                (causal_tags, "CAUSAL_IMPRINT"),
-                (kinetic_tags, "KINETIC_STRESS"),
-                (radiation_tags, "RADIATION_TRACE"),
-            ]
-            added = 0
-            for tag_set, sig_type in extras:
-                if added >= 2:
-                    break
-                if tags_lower & tag_set and sig_type not in signatures:
-                    add(sig_type)
-                    added += 1
+            # Step B: tag-driven extras (0-2). Every masked tag belongs to some
+            # extra, so a zero mask means there is nothing to scan.
+            if tags_mask:
+                added = 0
+                for extra_mask, sig_type in extras:
+                    if tags_mask & extra_mask and sig_type not in signatures:
+                        add(sig_type)
+                        added += 1
+                        if added == 2:
+                            break
 
             # Step C: hard fallback
             if not signatures:
                 add("VISUAL_ANOMALY", strength=5, persistence=1)
 
-        for sig_type, (strength, persistence) in signatures.items():
-            conn.execute("""
-                INSERT INTO power_expression_signature (expression_id, signature_type, strength, persistence_turns)
-                VALUES (?, ?, ?, ?)
-            """, (expr_id, sig_type, int(strength), int(persistence)))
-            created += 1
+        rows_sig.extend(
+            (expr_id, sig_type, int(strength), int(persistence))
+            for sig_type, (strength, persistence) in signatures.items()
+        )
 
-    conn.execute("COMMIT;")
-    print(f"Expression signatures created/updated: {created}")
+    written_sig = insert_values(
+        conn,
+        "INSERT INTO power_expression_signature (expression_id, signature_type, strength, persistence_turns)",
+        rows_sig,
+    )
+    print(f"Expression signatures created/updated: {written_sig}")
 
 
 # -------------------------
@@ -530,14 +646,18 @@ ORIGIN_RULES = [
 ]
 
 
-def generate_acquisition_profiles(conn: sqlite3.Connection, max_profiles_per_power: int = 3) -> None:
+def generate_acquisition_profiles(
+    conn: sqlite3.Connection,
+    max_profiles_per_power: int = 3,
+    tags_by_power: Optional[Dict[str, Set[str]]] = None,
+) -> None:
     require_tables(conn, ["power_acquisition_profile", "Superpower4", "power_tag"])
 
-    tags_by_power = load_power_tags(conn)
+    if tags_by_power is None:
+        tags_by_power = load_power_tags(conn)
     powers = load_powers(conn)
 
-    created = 0
-    conn.execute("BEGIN;")
+    rows_acq: List[Tuple] = []
 
     for power_id, power_name, kind in powers:
         tags = tags_by_power.get(power_id, set())
@@ -546,7 +666,7 @@ def generate_acquisition_profiles(conn: sqlite3.Connection, max_profiles_per_pow
 
         matches = []
         for match_tags, oclass, osub, channel, event_kind, req_entity, weight in ORIGIN_RULES:
-            if tags.intersection(match_tags):
+            if not tags.isdisjoint(match_tags):
                 matches.append((oclass, osub, channel, event_kind, req_entity, weight, match_tags))
 
         if not matches:
@@ -607,14 +727,7 @@ def generate_acquisition_profiles(conn: sqlite3.Connection, max_profiles_per_pow
             if oclass == "ASCENDANT" and osub == "GENETIC":
                 counterplay.append("suppressor")
 
-            conn.execute("""
-                INSERT OR REPLACE INTO power_acquisition_profile
-                (acq_id, power_id, origin_class, origin_subtype, delivery_channel, acquisition_event_kind,
-                 rarity_weight, requires_entity_kind, requires_tags_any, requires_tags_all,
-                 counterplay_tags, default_costs, default_limits, default_signatures,
-                 collateral_profile, stability_profile, notes, is_enabled)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?, ?, '{}', ?, ?, ?, NULL, 1)
-            """, (
+            rows_acq.append((
                 acq_id, power_id, oclass, osub, channel, event_kind,
                 int(weight),
                 req_entity,
@@ -626,10 +739,15 @@ def generate_acquisition_profiles(conn: sqlite3.Connection, max_profiles_per_pow
                 stability,
             ))
 
-            created += 1
-
-    conn.execute("COMMIT;")
-    print(f"Acquisition profiles created/updated: {created}")
+    written_acq = insert_batched(conn, """
+        INSERT OR REPLACE INTO power_acquisition_profile
+        (acq_id, power_id, origin_class, origin_subtype, delivery_channel, acquisition_event_kind,
+         rarity_weight, requires_entity_kind, requires_tags_any, requires_tags_all,
+         counterplay_tags, default_costs, default_limits, default_signatures,
+         collateral_profile, stability_profile, notes, is_enabled)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?, ?, '{}', ?, ?, ?, NULL, 1)
+    """, rows_acq)
+    print(f"Acquisition profiles created/updated: {written_acq}")
 
 
 # -------------------------
@@ -667,7 +785,11 @@ def main(db_path: Optional[str] = None) -> None:
         raise FileNotFoundError(f"DB not found at {db_file}")
 
     conn = sqlite3.connect(db_file)
+    _configure(conn)
     conn.execute("PRAGMA foreign_keys = ON;")
+    # Some SQLite builds default to zeroing freed pages; the run rewrites whole
+    # tables, and this content has nothing to scrub.
+    conn.execute("PRAGMA secure_delete = OFF;")
 
     # Check your DB has the expected tables
     require_tables(conn, [
@@ -678,18 +800,42 @@ def main(db_path: Optional[str] = None) -> None:
         "power_acquisition_profile"
     ])
 
+    # Without these the validation joins pick the low-selectivity is_enabled
+    # indexes and scan every enabled row per power. Composite (power_id, is_enabled)
+    # keys turn each join probe into one covering index lookup. They also serve
+    # every power_id-only lookup, so the single-column indexes are dropped.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_power_expression_power_enabled ON power_expression (power_id, is_enabled)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pap_power_enabled ON power_acquisition_profile (power_id, is_enabled)")
+    conn.execute("DROP INDEX IF EXISTS idx_power_expression_power_id")
+    conn.execute("DROP INDEX IF EXISTS idx_pap_power_id")
+
+    # Every generator writes into this one transaction, so the run commits once
+    # and a failure part-way leaves the previous content intact.
+    conn.execute("BEGIN;")
+
+    # Rebuilding each index once after the bulk load is cheaper than maintaining
+    # it row by row. DDL is transactional, so a failed run restores them too.
+    index_sql = drop_secondary_indexes(conn, GENERATED_TABLES)
+
     # 1) Seed templates (safe to re-run)
     seed_expression_templates(conn)
 
+    # power_tag is only read here, so one load serves every pass.
+    tags_by_power = load_power_tags(conn)
+
     # 2) Generate expressions (safe to re-run)
-    generate_power_expressions(conn, max_per_power=3)
+    generate_power_expressions(conn, max_per_power=3, tags_by_power=tags_by_power)
 
     # 3) Generate expression costs/signatures (safe to re-run)
-    generate_power_expression_costs(conn)
-    generate_power_expression_signatures(conn)
+    generate_power_expression_costs(conn, tags_by_power=tags_by_power)
+    generate_power_expression_signatures(conn, tags_by_power=tags_by_power)
 
     # 4) Generate acquisition profiles (safe to re-run)
-    generate_acquisition_profiles(conn, max_profiles_per_power=3)
+    generate_acquisition_profiles(conn, max_profiles_per_power=3, tags_by_power=tags_by_power)
+
+    for sql in index_sql:
+        conn.execute(sql)
+    conn.execute("COMMIT;")
 
     # 5) Validate coverage
     validate(conn)
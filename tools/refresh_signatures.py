@@ -4,13 +4,9 @@ import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
-sys.path.append(str(ROOT))
-
-from tools.populate_db import generate_power_expression_signatures
-
 DEFAULT_DB = ROOT / "Superpower_list.db"
 
-SIGNATURE_TYPES = [
+SIGNATURE_TYPES = (
     "VISUAL_ANOMALY",
     "EM_SPIKE",
     "THERMAL_BLOOM",
@@ -24,26 +20,61 @@ SIGNATURE_TYPES = [
     "CAUSAL_IMPRINT",
     "KINETIC_STRESS",
     "RADIATION_TRACE",
-]
+)
+# Kept in declaration order so the stored DDL stays stable across runs.
+ALLOWED_SQL = ",".join(f"'{t}'" for t in SIGNATURE_TYPES)
+
+
+def _configure(conn: sqlite3.Connection) -> None:
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA cache_size = -131072;")
+    conn.execute("PRAGMA mmap_size = 2147483648;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+
+
+SIGNATURE_TABLE_SQL = f"""
+    CREATE TABLE power_expression_signature (
+      signature_id INTEGER PRIMARY KEY,
+      expression_id TEXT NOT NULL,
+      signature_type TEXT NOT NULL CHECK (signature_type IN ({ALLOWED_SQL})),
+      strength INTEGER NOT NULL CHECK (strength BETWEEN 1 AND 100),
+      persistence_turns INTEGER NOT NULL DEFAULT 0 CHECK (persistence_turns >= 0),
+      FOREIGN KEY (expression_id) REFERENCES power_expression(expression_id) ON DELETE CASCADE
+    )
+"""
+
+
+# Serves the ON DELETE CASCADE from power_expression and per-expression lookups.
+SIGNATURE_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_pes_expression ON power_expression_signature (expression_id)"
+)
+
+
+def _normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
 
 
 def recreate_signature_table(conn: sqlite3.Connection) -> None:
-    allowed = ",".join(f"'{t}'" for t in SIGNATURE_TYPES)
-    conn.execute("PRAGMA foreign_keys = OFF;")
-    conn.execute("BEGIN;")
+    """Leave power_expression_signature empty and on the current schema.
+
+    The table is only dropped and recreated when its stored DDL differs from
+    SIGNATURE_TABLE_SQL (e.g. SIGNATURE_TYPES changed); otherwise its rows are
+    deleted in place, which avoids freeing and reallocating every page.
+    """
+    # Runs inside the caller's transaction. Nothing references this table, so
+    # dropping it with foreign keys enabled cannot trip a constraint.
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='power_expression_signature'"
+    ).fetchone()
+    if row and _normalize_sql(row[0]) == _normalize_sql(SIGNATURE_TABLE_SQL):
+        # The caller rebuilds the index once the new rows are in.
+        conn.execute("DROP INDEX IF EXISTS idx_pes_expression")
+        # With a plain rowid key, ids restart at 1 once the table is empty.
+        conn.execute("DELETE FROM power_expression_signature")
+        return
     conn.execute("DROP TABLE IF EXISTS power_expression_signature")
-    conn.execute(f"""
-        CREATE TABLE power_expression_signature (
-          signature_id INTEGER PRIMARY KEY AUTOINCREMENT,
-          expression_id TEXT NOT NULL,
-          signature_type TEXT NOT NULL CHECK (signature_type IN ({allowed})),
-          strength INTEGER NOT NULL CHECK (strength BETWEEN 1 AND 100),
-          persistence_turns INTEGER NOT NULL DEFAULT 0 CHECK (persistence_turns >= 0),
-          FOREIGN KEY (expression_id) REFERENCES power_expression(expression_id) ON DELETE CASCADE
-        )
-    """)
-    conn.execute("COMMIT;")
-    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute(SIGNATURE_TABLE_SQL)
 
 
 def main() -> None:
@@ -55,10 +86,32 @@ def main() -> None:
     if not db_path.exists():
         raise FileNotFoundError(f"DB not found at {db_path}")
 
+    # Imported late so --help and a bad --db fail fast without loading populate_db.
+    if str(ROOT) not in sys.path:
+        sys.path.append(str(ROOT))
+    from tools.populate_db import generate_power_expression_signatures
+
     conn = sqlite3.connect(db_path)
-    recreate_signature_table(conn)
-    generate_power_expression_signatures(conn)
-    conn.close()
+    try:
+        _configure(conn)
+        conn.execute("PRAGMA foreign_keys = ON;")
+        # Drop, recreate and refill commit together, so readers never see the
+        # table missing or empty.
+        conn.execute("BEGIN;")
+        recreate_signature_table(conn)
+        generate_power_expression_signatures(conn)
+        # One sorted build after the load instead of per-row index maintenance.
+        conn.execute(SIGNATURE_INDEX_SQL)
+        conn.execute("COMMIT;")
+
+        # Fresh statistics for the rebuilt table and index, for this DB and the export.
+        conn.execute("ANALYZE power_expression_signature;")
+        conn.execute("PRAGMA optimize;")
+        # Fold the WAL back in and truncate it, even if another connection
+        # keeps the file open past our close.
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    finally:
+        conn.close()
     print("Signatures refreshed.")
 
 